@@ -1,9 +1,13 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import db_session, require_teacher
+from app.api.deps import require_teacher
+from app.db.session import get_session
 from app.models.models import Assignment, Classroom, Lesson
 from app.models.models import User
 from app.schemas.schemas import AssignmentCreate, AssignmentRead
@@ -11,9 +15,24 @@ from app.schemas.schemas import AssignmentCreate, AssignmentRead
 
 router = APIRouter()
 
+_ASSIGNMENT_LIST_ADAPTER = TypeAdapter(List[AssignmentRead])
 
-def _ensure_lesson_owned_by_teacher(
-    session: Session,
+_LESSON_WITH_OWNER = (
+    select(Lesson, Classroom.teacher_id)
+    .join(Classroom, Classroom.id == Lesson.classroom_id)
+    .where(Lesson.id == bindparam("lesson_id"))
+)
+_ASSIGNMENT_WITH_OWNER = (
+    select(Assignment, Classroom.teacher_id)
+    .join(Lesson, Lesson.id == Assignment.lesson_id)
+    .join(Classroom, Classroom.id == Lesson.classroom_id)
+    .where(Assignment.id == bindparam("assignment_id"))
+)
+_ASSIGNMENTS_BY_LESSON = select(Assignment).where(Assignment.lesson_id == bindparam("lesson_id"))
+
+
+async def _ensure_lesson_owned_by_teacher(
+    session: AsyncSession,
     lesson_id: int,
     teacher_id: int,
 ) -> Lesson:
@@ -31,12 +50,14 @@ def _ensure_lesson_owned_by_teacher(
     Raises:
         HTTPException: If the lesson or classroom is not found or unauthorized.
     """
-    lesson = session.get(Lesson, lesson_id)
-    if lesson is None:
+    # Resolve the lesson and its owning teacher in a single round trip.
+    result = await session.exec(_LESSON_WITH_OWNER, params={"lesson_id": lesson_id})
+    row = result.first()
+    if row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
 
-    classroom = session.get(Classroom, lesson.classroom_id)
-    if classroom is None or classroom.teacher_id != teacher_id:
+    lesson, owner_id = row
+    if owner_id != teacher_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to manage assignments for this lesson",
@@ -45,15 +66,15 @@ def _ensure_lesson_owned_by_teacher(
 
 
 @router.post("", response_model=AssignmentRead, status_code=status.HTTP_201_CREATED)
-def create_assignment(
+async def create_assignment(
     payload: AssignmentCreate,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_teacher: User = Depends(require_teacher),
 ) -> AssignmentRead:
     """
     Create an assignment under a lesson owned by the current teacher.
     """
-    _ensure_lesson_owned_by_teacher(session, payload.lesson_id, current_teacher.id)
+    await _ensure_lesson_owned_by_teacher(session, payload.lesson_id, current_teacher.id)
 
     assignment = Assignment(
         lesson_id=payload.lesson_id,
@@ -64,39 +85,45 @@ def create_assignment(
         is_published=payload.is_published,
     )
     session.add(assignment)
-    session.commit()
-    session.refresh(assignment)
+    await session.commit()
+    await session.refresh(assignment)
     return AssignmentRead.model_validate(assignment, from_attributes=True)
 
 
 @router.get("/lessons/{lesson_id}", response_model=List[AssignmentRead])
-def list_assignments_for_lesson(
+async def list_assignments_for_lesson(
     lesson_id: int,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_teacher: User = Depends(require_teacher),
 ) -> List[AssignmentRead]:
     """
     List assignments for a lesson owned by the current teacher.
     """
-    _ensure_lesson_owned_by_teacher(session, lesson_id, current_teacher.id)
-    statement = select(Assignment).where(Assignment.lesson_id == lesson_id)
-    results = session.exec(statement).all()
-    return [AssignmentRead.model_validate(item, from_attributes=True) for item in results]
+    await _ensure_lesson_owned_by_teacher(session, lesson_id, current_teacher.id)
+    result = await session.exec(_ASSIGNMENTS_BY_LESSON, params={"lesson_id": lesson_id})
+    results = result.all()
+    return _ASSIGNMENT_LIST_ADAPTER.validate_python(results, from_attributes=True)
 
 
 @router.get("/{assignment_id}", response_model=AssignmentRead)
-def get_assignment(
+async def get_assignment(
     assignment_id: int,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_teacher: User = Depends(require_teacher),
 ) -> AssignmentRead:
     """
     Retrieve a single assignment, ensuring it is under a lesson owned by the current teacher.
     """
-    assignment = session.get(Assignment, assignment_id)
-    if assignment is None:
+    result = await session.exec(_ASSIGNMENT_WITH_OWNER, params={"assignment_id": assignment_id})
+    row = result.first()
+    if row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
 
-    _ensure_lesson_owned_by_teacher(session, assignment.lesson_id, current_teacher.id)
+    assignment, owner_id = row
+    if owner_id != current_teacher.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to manage assignments for this lesson",
+        )
     return AssignmentRead.model_validate(assignment, from_attributes=True)
 
@@ -1,77 +1,194 @@
+import hashlib
+import hmac
+import secrets
+from typing import Optional
+
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session, select
-
-from app.api.deps import db_session
-from app.core.security import create_access_token, get_password_hash, verify_password
+from sqlalchemy import bindparam
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.security import (
+    aget_password_hash,
+    averify_password,
+    create_access_token,
+    get_password_hash,
+)
+from app.db.session import get_session
 from app.models.models import User, UserRole
 from app.schemas.schemas import LoginRequest, Token, UserCreate, UserRead, UserRegister
 
 
 router = APIRouter()
 
+# Verified against when the email is unknown so that failed logins cost one bcrypt
+# check whether or not the account exists (no user-enumeration timing signal).
+# The password is random so the dummy hash cannot be matched (or cached) by a client.
+_DUMMY_PASSWORD_HASH = get_password_hash(secrets.token_urlsafe())
 
-@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register_user(payload: UserCreate, session: Session = Depends(db_session)) -> UserRead:
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
+# Recent successful logins keyed by stored hash. Values are a SHA-256 digest of the
+# stored hash and the submitted password, letting bursty retries skip bcrypt. Only
+# real users' hashes are cached; see `_authenticate_user`.
+_VERIFIED_LOGIN_CACHE = TTLCache(maxsize=1024, ttl=5)
+
+
+async def _verify_login_password(password: str, hashed_password: str) -> bool:
     """
-    Register a new user.
+    Verify a login password, reusing very recent successful verifications.
+
+    Args:
+        password: Raw password provided by the client.
+        hashed_password: Stored password hash.
+
+    Returns:
+        bool: True if the password matches the stored hash.
+    """
+    digest = hashlib.sha256(
+        hashed_password.encode("utf-8") + b"\0" + password.encode("utf-8")
+    ).digest()
+    cached_digest = _VERIFIED_LOGIN_CACHE.get(hashed_password)
+    if cached_digest is not None and hmac.compare_digest(cached_digest, digest):
+        return True
 
-    Email uniqueness is enforced at the application level before insertion.
+    if not await averify_password(password, hashed_password):
+        return False
+    _VERIFIED_LOGIN_CACHE[hashed_password] = digest
+    return True
+
+
+async def _authenticate_user(session: AsyncSession, email: str, password: str) -> Optional[User]:
+    """
+    Resolve a user by email and verify their password.
+
+    A password hash is always verified, even when no user matches the email, so
+    that response timing does not reveal which accounts exist.
+
+    Args:
+        session: Database session.
+        email: Login email address.
+        password: Raw password provided by the client.
+
+    Returns:
+        Optional[User]: The authenticated user, or None if the credentials are invalid.
+    """
+    user = (await session.exec(_USER_BY_EMAIL, params={"email": email})).first()
+    if user is None:
+        # Always pay for a full bcrypt check here; a cache hit would make unknown
+        # emails measurably faster than existing accounts.
+        await averify_password(password, _DUMMY_PASSWORD_HASH)
+        return None
+    if not await _verify_login_password(password, user.hashed_password):
+        return None
+    return user
+
+
+async def _persist_user(
+    session: AsyncSession,
+    *,
+    email: str,
+    full_name: str,
+    password: str,
+    role: UserRole,
+) -> User:
     """
-    existing = session.exec(select(User).where(User.email == payload.email)).first()
-    if existing:
+    Hash the password and insert a new user.
+
+    Email uniqueness is enforced by the unique index on `user.email`.
+
+    Args:
+        session: Database session.
+        email: User email address.
+        full_name: User display name.
+        password: Raw password.
+        role: Role assigned to the new user.
+
+    Returns:
+        User: The persisted user.
+
+    Raises:
+        HTTPException: If the email is already registered.
+    """
+    user = User(
+        email=email,
+        full_name=full_name,
+        role=role,
+        hashed_password=await aget_password_hash(password),
+    )
+    session.add(user)
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email is already registered",
         )
+    await session.refresh(user)
+    return user
 
-    user = User(
+
+@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+async def register_user(
+    payload: UserCreate,
+    session: AsyncSession = Depends(get_session),
+) -> UserRead:
+    """
+    Register a new user.
+    """
+    user = await _persist_user(
+        session,
         email=payload.email,
         full_name=payload.full_name,
+        password=payload.password,
         role=payload.role,
-        hashed_password=get_password_hash(payload.password),
     )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
     return UserRead.model_validate(user, from_attributes=True)
 
 
 @router.post("/register/student", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register_student(payload: UserRegister, session: Session = Depends(db_session)) -> UserRead:
+async def register_student(
+    payload: UserRegister,
+    session: AsyncSession = Depends(get_session),
+) -> UserRead:
     """
     Register a new STUDENT user.
     """
-    return register_user(
-        UserCreate(
-            email=payload.email,
-            full_name=payload.full_name,
-            password=payload.password,
-            role=UserRole.STUDENT,
-        ),
-        session=session,
+    user = await _persist_user(
+        session,
+        email=payload.email,
+        full_name=payload.full_name,
+        password=payload.password,
+        role=UserRole.STUDENT,
     )
+    return UserRead.model_validate(user, from_attributes=True)
 
 
 @router.post("/register/teacher", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register_teacher(payload: UserRegister, session: Session = Depends(db_session)) -> UserRead:
+async def register_teacher(
+    payload: UserRegister,
+    session: AsyncSession = Depends(get_session),
+) -> UserRead:
     """
     Register a new TEACHER user.
     """
-    return register_user(
-        UserCreate(
-            email=payload.email,
-            full_name=payload.full_name,
-            password=payload.password,
-            role=UserRole.TEACHER,
-        ),
-        session=session,
+    user = await _persist_user(
+        session,
+        email=payload.email,
+        full_name=payload.full_name,
+        password=payload.password,
+        role=UserRole.TEACHER,
     )
+    return UserRead.model_validate(user, from_attributes=True)
 
 
 @router.post("/login", response_model=Token)
-def login(
-    session: Session = Depends(db_session),
+async def login(
+    session: AsyncSession = Depends(get_session),
     form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Token:
     """
@@ -79,9 +196,8 @@ def login(
 
     The OAuth2 password flow sends username and password as form fields.
     """
-    statement = select(User).where(User.email == form_data.username)
-    user = session.exec(statement).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await _authenticate_user(session, form_data.username, form_data.password)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -93,15 +209,17 @@ def login(
 
 
 @router.post("/login/json", response_model=Token)
-def login_json(payload: LoginRequest, session: Session = Depends(db_session)) -> Token:
+async def login_json(
+    payload: LoginRequest,
+    session: AsyncSession = Depends(get_session),
+) -> Token:
     """
     Authenticate a user and return a JWT access token (JSON body).
 
     This endpoint is easier to use than OAuth2PasswordRequestForm in many clients.
     """
-    statement = select(User).where(User.email == payload.email)
-    user = session.exec(statement).first()
-    if not user or not verify_password(payload.password, user.hashed_password):
+    user = await _authenticate_user(session, payload.email, payload.password)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -1,19 +1,34 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from app.api.deps import db_session, require_teacher
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.mysql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.api.deps import require_teacher
+from app.db.session import get_session
 from app.models.models import Classroom, ClassroomEnrollment, User, UserRole
 from app.schemas.schemas import ClassroomCreate, ClassroomRead, EnrollmentCreate
 
 
 router = APIRouter()
 
+_CLASSROOM_LIST_ADAPTER = TypeAdapter(List[ClassroomRead])
+
+_CLASSROOMS_BY_TEACHER = select(Classroom).where(Classroom.teacher_id == bindparam("teacher_id"))
+_CLASSROOM_OWNER_AND_STUDENT_ROLE = (
+    select(Classroom.teacher_id, User.role)
+    .select_from(Classroom)
+    .outerjoin(User, User.id == bindparam("student_id"))
+    .where(Classroom.id == bindparam("classroom_id"))
+)
+
 
 @router.post("", response_model=ClassroomRead, status_code=status.HTTP_201_CREATED)
-def create_classroom(
+async def create_classroom(
     payload: ClassroomCreate,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_teacher: User = Depends(require_teacher),
 ) -> ClassroomRead:
     """
@@ -25,44 +40,44 @@ def create_classroom(
         teacher_id=current_teacher.id,
     )
     session.add(classroom)
-    session.commit()
-    session.refresh(classroom)
+    await session.commit()
+    await session.refresh(classroom)
     return ClassroomRead.model_validate(classroom, from_attributes=True)
 
 
 @router.get("", response_model=List[ClassroomRead])
-def list_classrooms(
-    session: Session = Depends(db_session),
+async def list_classrooms(
+    session: AsyncSession = Depends(get_session),
     current_teacher: User = Depends(require_teacher),
 ) -> List[ClassroomRead]:
     """
     List classrooms owned by the current teacher.
     """
-    statement = select(Classroom).where(Classroom.teacher_id == current_teacher.id)
-    results = session.exec(statement).all()
-    return [ClassroomRead.model_validate(item, from_attributes=True) for item in results]
+    result = await session.exec(_CLASSROOMS_BY_TEACHER, params={"teacher_id": current_teacher.id})
+    results = result.all()
+    return _CLASSROOM_LIST_ADAPTER.validate_python(results, from_attributes=True)
 
 
 @router.get("/{classroom_id}", response_model=ClassroomRead)
-def get_classroom(
+async def get_classroom(
     classroom_id: int,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_teacher: User = Depends(require_teacher),
 ) -> ClassroomRead:
     """
     Retrieve a classroom by ID, ensuring it belongs to the current teacher.
     """
-    classroom = session.get(Classroom, classroom_id)
+    classroom = await session.get(Classroom, classroom_id)
     if classroom is None or classroom.teacher_id != current_teacher.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Classroom not found")
     return ClassroomRead.model_validate(classroom, from_attributes=True)
 
 
 @router.post("/{classroom_id}/enroll", status_code=status.HTTP_204_NO_CONTENT)
-def enroll_student(
+async def enroll_student(
     classroom_id: int,
     payload: EnrollmentCreate,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_teacher: User = Depends(require_teacher),
 ) -> None:
     """
@@ -70,25 +85,27 @@ def enroll_student(
 
     Only the owning teacher can enroll students into their classroom.
     """
-    classroom = session.get(Classroom, classroom_id)
-    if classroom is None or classroom.teacher_id != current_teacher.id:
+    # Validate the classroom owner and the student's role in one round trip.
+    result = await session.exec(
+        _CLASSROOM_OWNER_AND_STUDENT_ROLE,
+        params={"classroom_id": classroom_id, "student_id": payload.student_id},
+    )
+    row = result.first()
+    if row is None or row.teacher_id != current_teacher.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Classroom not found")
 
-    # Simple existence check; we only allow students to be enrolled.
-    from app.models.models import User  # Local import to avoid circular dependency
-
-    student = session.get(User, payload.student_id)
-    if student is None or student.role != UserRole.STUDENT:
+    # We only allow students to be enrolled.
+    if row.role != UserRole.STUDENT:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid student_id")
 
-    existing = session.get(
-        ClassroomEnrollment, {"classroom_id": classroom_id, "student_id": payload.student_id}
+    # Idempotent enrollments: re-enrolling an existing student is a no-op upsert.
+    insert_statement = insert(ClassroomEnrollment).values(
+        classroom_id=classroom_id,
+        student_id=payload.student_id,
     )
-    if existing:
-        # Idempotent enrollments: silently succeed if already enrolled.
-        return
-
-    enrollment = ClassroomEnrollment(classroom_id=classroom_id, student_id=payload.student_id)
-    session.add(enrollment)
-    session.commit()
-
+    await session.exec(
+        insert_statement.on_duplicate_key_update(
+            classroom_id=insert_statement.inserted.classroom_id,
+        )
+    )
+    await session.commit()
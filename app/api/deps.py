@@ -1,9 +1,12 @@
-from typing import Generator, Optional
+from typing import Optional
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
-from sqlmodel import Session, select
+from jwt import PyJWTError
+from sqlalchemy import bindparam
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 from app.core.security import decode_access_token
@@ -13,18 +16,17 @@ from app.models.models import User, UserRole
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/auth/login")
 
+# Authenticated users keyed by (user ID, token `iat`). A dashboard fires several
+# requests with the same token; the short TTL bounds how long a role change or
+# deletion takes to reach tokens that are already issued.
+_CURRENT_USER_CACHE = TTLCache(maxsize=10_000, ttl=30)
 
-def db_session() -> Generator[Session, None, None]:
-    """
-    FastAPI dependency that provides a database session.
-    """
-    with get_session() as session:
-        yield session
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
 ) -> User:
     """
     Resolve the currently authenticated user from a JWT token.
@@ -51,18 +53,25 @@ def get_current_user(
         if user_id is None:
             raise credentials_exception
         user_id = int(user_id)
-    except (JWTError, ValueError):
+    except (PyJWTError, ValueError):
         raise credentials_exception
 
-    statement = select(User).where(User.id == user_id)
-    user = session.exec(statement).first()
+    cache_key = (user_id, payload.get("iat"))
+    cached_user = _CURRENT_USER_CACHE.get(cache_key)
+    if cached_user is not None:
+        return cached_user
+
+    user = (await session.exec(_USER_BY_ID, params={"user_id": user_id})).first()
     if user is None:
         raise credentials_exception
 
+    # Detach the instance so it can be shared across requests and sessions.
+    session.expunge(user)
+    _CURRENT_USER_CACHE[cache_key] = user
     return user
 
 
-def require_teacher(current_user: User = Depends(get_current_user)) -> User:
+async def require_teacher(current_user: User = Depends(get_current_user)) -> User:
     """
     Ensure the current user has a teacher role.
 
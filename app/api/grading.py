@@ -1,10 +1,12 @@
-from datetime import datetime
+from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import db_session, require_teacher
-from app.models.models import Assignment, Classroom, Lesson, Submission, User
+from app.api.deps import require_teacher
+from app.api.queries import SUBMISSION_WITH_OWNER
+from app.db.session import get_session
+from app.models.models import User
 from app.schemas.schemas import GradeUpdate, SubmissionRead
 
 
@@ -16,10 +18,10 @@ router = APIRouter()
     response_model=SubmissionRead,
     status_code=status.HTTP_200_OK,
 )
-def grade_submission(
+async def grade_submission(
     submission_id: int,
     payload: GradeUpdate,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_teacher: User = Depends(require_teacher),
 ) -> SubmissionRead:
     """
@@ -27,17 +29,13 @@ def grade_submission(
 
     Teachers may only grade submissions for assignments in classrooms they own.
     """
-    submission = session.get(Submission, submission_id)
-    if submission is None:
+    result = await session.exec(SUBMISSION_WITH_OWNER, params={"submission_id": submission_id})
+    row = result.first()
+    if row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Submission not found")
 
-    assignment = session.get(Assignment, submission.assignment_id)
-    if assignment is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
-
-    lesson = session.get(Lesson, assignment.lesson_id)
-    classroom = session.get(Classroom, lesson.classroom_id) if lesson else None
-    if classroom is None or classroom.teacher_id != current_teacher.id:
+    submission, owner_id = row
+    if owner_id != current_teacher.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to grade this submission",
@@ -47,12 +45,12 @@ def grade_submission(
         submission.score = payload.score
     if payload.feedback is not None:
         submission.feedback = payload.feedback
-    submission.graded_at = datetime.utcnow()
+    submission.graded_at = datetime.now(timezone.utc)
     submission.graded_by = current_teacher.id
 
     session.add(submission)
-    session.commit()
-    session.refresh(submission)
+    await session.commit()
+    await session.refresh(submission)
     return SubmissionRead.model_validate(submission, from_attributes=True)
 
 
@@ -60,10 +58,10 @@ def grade_submission(
     "/submissions/{submission_id}/grade",
     response_model=SubmissionRead,
 )
-def update_grade(
+async def update_grade(
     submission_id: int,
     payload: GradeUpdate,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_teacher: User = Depends(require_teacher),
 ) -> SubmissionRead:
     """
@@ -71,7 +69,7 @@ def update_grade(
 
     This endpoint behaves the same as `grade_submission` but uses PATCH semantics.
     """
-    return grade_submission(
+    return await grade_submission(
         submission_id=submission_id,
         payload=payload,
         session=session,
@@ -1,16 +1,21 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 
 router = APIRouter()
 
+# The payload never changes, so it is encoded once rather than serialized per probe.
+_HEALTHY_BODY = b'{"status":"healthy"}'
+
 
 @router.get("/health", summary="Health check")
-def health() -> dict:
+async def health() -> Response:
     """
     Lightweight health endpoint for monitoring.
 
+    A new `Response` is built per request because middleware may append headers
+    to it; only the body is shared.
+
     Returns:
-        dict: Simple status payload.
+        Response: Simple JSON status payload.
     """
-    return {"status": "healthy"}
-
+    return Response(content=_HEALTHY_BODY, media_type="application/json")
@@ -1,26 +1,34 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import db_session, require_teacher
+from app.api.deps import require_teacher
+from app.db.session import get_session
 from app.models.models import Classroom, Lesson, User
 from app.schemas.schemas import LessonCreate, LessonRead
 
 
 router = APIRouter()
 
+_LESSON_LIST_ADAPTER = TypeAdapter(List[LessonRead])
+
+_LESSONS_BY_CLASSROOM = select(Lesson).where(Lesson.classroom_id == bindparam("classroom_id"))
+
 
 @router.post("", response_model=LessonRead, status_code=status.HTTP_201_CREATED)
-def create_lesson(
+async def create_lesson(
     payload: LessonCreate,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_teacher: User = Depends(require_teacher),
 ) -> LessonRead:
     """
     Create a lesson under a classroom owned by the current teacher.
     """
-    classroom = session.get(Classroom, payload.classroom_id)
+    classroom = await session.get(Classroom, payload.classroom_id)
     if classroom is None or classroom.teacher_id != current_teacher.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Classroom not found")
 
@@ -31,25 +39,25 @@ def create_lesson(
         scheduled_at=payload.scheduled_at,
     )
     session.add(lesson)
-    session.commit()
-    session.refresh(lesson)
+    await session.commit()
+    await session.refresh(lesson)
     return LessonRead.model_validate(lesson, from_attributes=True)
 
 
 @router.get("/classrooms/{classroom_id}", response_model=List[LessonRead])
-def list_lessons_for_classroom(
+async def list_lessons_for_classroom(
     classroom_id: int,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_teacher: User = Depends(require_teacher),
 ) -> List[LessonRead]:
     """
     List lessons for a classroom owned by the current teacher.
     """
-    classroom = session.get(Classroom, classroom_id)
+    classroom = await session.get(Classroom, classroom_id)
     if classroom is None or classroom.teacher_id != current_teacher.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Classroom not found")
 
-    statement = select(Lesson).where(Lesson.classroom_id == classroom_id)
-    results = session.exec(statement).all()
-    return [LessonRead.model_validate(item, from_attributes=True) for item in results]
+    result = await session.exec(_LESSONS_BY_CLASSROOM, params={"classroom_id": classroom_id})
+    results = result.all()
+    return _LESSON_LIST_ADAPTER.validate_python(results, from_attributes=True)
 
@@ -0,0 +1,17 @@
+from sqlalchemy import bindparam
+from sqlmodel import select
+
+from app.models.models import Assignment, Classroom, Lesson, Submission
+
+
+# Statements shared by several routers. Defined outside the router modules so the
+# routers do not import from each other.
+
+# Resolve the submission and the teacher owning its classroom in one query.
+SUBMISSION_WITH_OWNER = (
+    select(Submission, Classroom.teacher_id)
+    .join(Assignment, Assignment.id == Submission.assignment_id)
+    .join(Lesson, Lesson.id == Assignment.lesson_id)
+    .join(Classroom, Classroom.id == Lesson.classroom_id)
+    .where(Submission.id == bindparam("submission_id"))
+)
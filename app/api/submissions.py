@@ -1,71 +1,161 @@
+import itertools
 import os
-from datetime import datetime
+import time
+from pathlib import PurePosixPath
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from sqlmodel import Session, select
-
-from app.api.deps import db_session, get_current_user
-from app.core.config import settings
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
+from sqlalchemy import and_, bindparam
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import get_current_user
+from app.api.queries import SUBMISSION_WITH_OWNER
+from app.core.config import Settings, get_settings
+from app.db.session import get_session
 from app.models.models import Assignment, Classroom, ClassroomEnrollment, Lesson, Submission, User, UserRole
 from app.schemas.schemas import SubmissionCreate, SubmissionRead
 
 
 router = APIRouter()
 
+_SUBMISSION_LIST_ADAPTER = TypeAdapter(List[SubmissionRead])
+
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Disambiguates uploads within the same nanosecond; next() is atomic under the GIL.
+_UPLOAD_COUNTER = itertools.count()
 
-def _ensure_student_enrolled_for_assignment(
-    session: Session,
-    assignment: Assignment,
+_ASSIGNMENT_WITH_ENROLLMENT = (
+    select(Assignment, ClassroomEnrollment.student_id)
+    .join(Lesson, Lesson.id == Assignment.lesson_id)
+    .outerjoin(
+        ClassroomEnrollment,
+        and_(
+            ClassroomEnrollment.classroom_id == Lesson.classroom_id,
+            ClassroomEnrollment.student_id == bindparam("student_id"),
+        ),
+    )
+    .where(Assignment.id == bindparam("assignment_id"))
+)
+_ASSIGNMENT_OWNER_ID = (
+    select(Classroom.teacher_id)
+    .select_from(Assignment)
+    .join(Lesson, Lesson.id == Assignment.lesson_id)
+    .join(Classroom, Classroom.id == Lesson.classroom_id)
+    .where(Assignment.id == bindparam("assignment_id"))
+)
+_SUBMISSIONS_BY_ASSIGNMENT = select(Submission).where(
+    Submission.assignment_id == bindparam("assignment_id")
+)
+_SUBMISSIONS_BY_ASSIGNMENT_AND_STUDENT = select(Submission).where(
+    Submission.assignment_id == bindparam("assignment_id"),
+    Submission.student_id == bindparam("student_id"),
+)
+
+
+async def _get_assignment_for_student(
+    session: AsyncSession,
+    assignment_id: int,
     student_id: int,
-) -> None:
+) -> Assignment:
     """
-    Ensure the student is enrolled in the classroom associated with the assignment.
+    Resolve an assignment and ensure the student is enrolled in its classroom.
+
+    The assignment, its lesson and the student's enrollment are resolved in a
+    single query instead of one lookup per entity.
 
     Args:
         session: Database session.
-        assignment: Assignment entity.
+        assignment_id: Target assignment ID.
         student_id: Student user ID.
 
+    Returns:
+        Assignment: The resolved assignment.
+
     Raises:
-        HTTPException: If the student is not enrolled.
+        HTTPException: If the assignment is not found or the student is not enrolled.
     """
-    lesson = session.get(Lesson, assignment.lesson_id)
-    if lesson is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
-    classroom = session.get(Classroom, lesson.classroom_id)
-    if classroom is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Classroom not found")
-
-    enrollment = session.get(
-        ClassroomEnrollment,
-        {"classroom_id": classroom.id, "student_id": student_id},
+    result = await session.exec(
+        _ASSIGNMENT_WITH_ENROLLMENT,
+        params={"assignment_id": assignment_id, "student_id": student_id},
     )
-    if enrollment is None:
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
+
+    assignment, enrolled_student_id = row
+    if enrolled_student_id is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Student is not enrolled in this classroom",
         )
+    return assignment
+
+
+async def _get_assignment_owner_id(session: AsyncSession, assignment_id: int) -> int:
+    """
+    Return the ID of the teacher owning the classroom of an assignment.
+
+    Args:
+        session: Database session.
+        assignment_id: Target assignment ID.
+
+    Returns:
+        int: Teacher user ID owning the assignment's classroom.
+
+    Raises:
+        HTTPException: If the assignment is not found.
+    """
+    result = await session.exec(_ASSIGNMENT_OWNER_ID, params={"assignment_id": assignment_id})
+    owner_id = result.first()
+    if owner_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
+    return owner_id
 
 
-def _save_uploaded_file(file: UploadFile) -> str:
+def _save_uploaded_file(file: UploadFile, settings: Settings) -> str:
     """
-    Persist an uploaded file to disk and return its path.
+    Stream an uploaded file to disk and return its path.
+
+    The upload is copied in fixed-size chunks so memory stays bounded, and the
+    size limit is enforced while writing rather than by seeking through the file.
 
     Args:
         file: Incoming uploaded file.
+        settings: Settings providing the upload directory and size limit.
 
     Returns:
         str: Relative file path where the file is stored.
+
+    Raises:
+        HTTPException: If the file exceeds the configured maximum upload size.
     """
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
-    safe_name = file.filename or "submission"
-    file_name = f"{timestamp}_{safe_name}"
+    upload_id = f"{time.time_ns():x}-{next(_UPLOAD_COUNTER):x}"
+    # Keep only the final path component so client filenames cannot escape UPLOAD_DIR.
+    safe_name = PurePosixPath((file.filename or "").replace("\\", "/")).name or "submission"
+    file_name = f"{upload_id}_{safe_name}"
     file_path = os.path.join(settings.UPLOAD_DIR, file_name)
 
-    with open(file_path, "wb") as buffer:
-        buffer.write(file.file.read())
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := file.file.read(_UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                if written > settings.MAX_UPLOAD_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Uploaded file is too large",
+                    )
+                buffer.write(chunk)
+    except BaseException:
+        # Never leave partial or oversized uploads behind.
+        os.unlink(file_path)
+        raise
 
     return file_path
 
@@ -75,17 +165,19 @@ def _save_uploaded_file(file: UploadFile) -> str:
     response_model=SubmissionRead,
     status_code=status.HTTP_201_CREATED,
 )
-def create_submission(
+async def create_submission(
     assignment_id: int,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
     payload: SubmissionCreate = Depends(),
     file: Optional[UploadFile] = File(default=None),
+    settings: Settings = Depends(get_settings),
 ) -> SubmissionRead:
     """
     Create a submission for an assignment as a student.
 
     The current user must be a STUDENT and enrolled in the classroom for the assignment.
+    Each student can submit an assignment once.
     """
     if current_user.role != UserRole.STUDENT:
         raise HTTPException(
@@ -93,23 +185,11 @@ def create_submission(
             detail="Only students can create submissions",
         )
 
-    assignment = session.get(Assignment, assignment_id)
-    if assignment is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
-
-    _ensure_student_enrolled_for_assignment(session, assignment, current_user.id)
+    await _get_assignment_for_student(session, assignment_id, current_user.id)
 
     file_path: Optional[str] = None
     if file is not None:
-        file.file.seek(0, os.SEEK_END)
-        size = file.file.tell()
-        file.file.seek(0)
-        if size > settings.MAX_UPLOAD_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Uploaded file is too large",
-            )
-        file_path = _save_uploaded_file(file)
+        file_path = await run_in_threadpool(_save_uploaded_file, file, settings)
 
     submission = Submission(
         assignment_id=assignment_id,
@@ -118,8 +198,18 @@ def create_submission(
         file_path=file_path,
     )
     session.add(submission)
-    session.commit()
-    session.refresh(submission)
+    try:
+        await session.commit()
+    except IntegrityError:
+        # The unique constraint on (assignment_id, student_id) rejects resubmissions.
+        await session.rollback()
+        if file_path is not None:
+            os.unlink(file_path)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Assignment has already been submitted",
+        )
+    await session.refresh(submission)
     return SubmissionRead.model_validate(submission, from_attributes=True)
 
 
@@ -127,9 +217,9 @@ def create_submission(
     "/assignments/{assignment_id}/submissions",
     response_model=List[SubmissionRead],
 )
-def list_submissions_for_assignment(
+async def list_submissions_for_assignment(
     assignment_id: int,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> List[SubmissionRead]:
     """
@@ -138,37 +228,34 @@ def list_submissions_for_assignment(
     - Teachers can view all submissions for assignments they own.
     - Students can only view their own submissions.
     """
-    assignment = session.get(Assignment, assignment_id)
-    if assignment is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
+    owner_id = await _get_assignment_owner_id(session, assignment_id)
 
     if current_user.role == UserRole.TEACHER:
         # Ensure teacher owns the classroom via lesson->classroom.
-        lesson = session.get(Lesson, assignment.lesson_id)
-        if lesson is None:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
-        classroom = session.get(Classroom, lesson.classroom_id)
-        if classroom is None or classroom.teacher_id != current_user.id:
+        if owner_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to view submissions for this assignment",
             )
-        statement = select(Submission).where(Submission.assignment_id == assignment_id)
+        result = await session.exec(
+            _SUBMISSIONS_BY_ASSIGNMENT,
+            params={"assignment_id": assignment_id},
+        )
     else:
         # Student: restrict to own submissions.
-        statement = select(Submission).where(
-            Submission.assignment_id == assignment_id,
-            Submission.student_id == current_user.id,
+        result = await session.exec(
+            _SUBMISSIONS_BY_ASSIGNMENT_AND_STUDENT,
+            params={"assignment_id": assignment_id, "student_id": current_user.id},
         )
 
-    results = session.exec(statement).all()
-    return [SubmissionRead.model_validate(item, from_attributes=True) for item in results]
+    results = result.all()
+    return _SUBMISSION_LIST_ADAPTER.validate_python(results, from_attributes=True)
 
 
 @router.get("/{submission_id}", response_model=SubmissionRead)
-def get_submission(
+async def get_submission(
     submission_id: int,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> SubmissionRead:
     """
@@ -177,28 +264,23 @@ def get_submission(
     - Students can only view their own submissions.
     - Teachers can view submissions for assignments they own.
     """
-    submission = session.get(Submission, submission_id)
-    if submission is None:
+    result = await session.exec(SUBMISSION_WITH_OWNER, params={"submission_id": submission_id})
+    row = result.first()
+    if row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Submission not found")
 
-    assignment = session.get(Assignment, submission.assignment_id)
-    if assignment is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
-
+    submission, owner_id = row
     if current_user.role == UserRole.STUDENT and submission.student_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to view this submission",
         )
 
-    if current_user.role == UserRole.TEACHER:
-        lesson = session.get(Lesson, assignment.lesson_id)
-        classroom = session.get(Classroom, lesson.classroom_id) if lesson else None
-        if classroom is None or classroom.teacher_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to view this submission",
-            )
+    if current_user.role == UserRole.TEACHER and owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this submission",
+        )
 
     return SubmissionRead.model_validate(submission, from_attributes=True)
 
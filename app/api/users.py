@@ -9,7 +9,7 @@ router = APIRouter()
 
 
 @router.get("/me", response_model=UserRead)
-def read_current_user(current_user: User = Depends(get_current_user)) -> UserRead:
+async def read_current_user(current_user: User = Depends(get_current_user)) -> UserRead:
     """
     Return the currently authenticated user.
     """
@@ -1,48 +1,203 @@
+import asyncio
+import base64
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta, timezone
 import hashlib
-from typing import Any, Dict, Optional
+import hmac
+import multiprocessing
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
+import jwt
+from cachetools import TLRUCache
 
 from app.core.config import settings
 
 
-# bcrypt has a 72-byte input limit. `bcrypt_sha256` transparently hashes long
-# passwords with SHA-256 first, then applies bcrypt. This avoids runtime errors
-# and is a common best practice when using bcrypt.
-pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
+# bcrypt has a 72-byte input limit, so passwords are pre-hashed with HMAC-SHA256
+# (keyed by the bcrypt salt) and base64-encoded before bcrypt. Hashes are stored in
+# passlib's `bcrypt_sha256` v2 format, so hashes created through passlib still verify:
+#   $bcrypt-sha256$v=2,t=2b,r=<rounds>$<22-char salt>$<31-char bcrypt checksum>
+_BCRYPT_SHA256_RE = re.compile(
+    r"^\$bcrypt-sha256\$v=2,t=(2a|2b),r=(\d{1,2})\$([./A-Za-z0-9]{22})\$([./A-Za-z0-9]{31})$"
+)
+
+
+# bcrypt is CPU-bound by design; async callers hash in worker processes so the event
+# loop keeps serving other requests. Created lazily (never at import, so forked server
+# workers each get their own) and with "spawn" so workers inherit no loop or sockets.
+# Rebuilt if a worker dies (e.g. OOM-killed), which breaks the whole executor.
+_HASH_POOL: Optional[ProcessPoolExecutor] = None
+_HASH_POOL_LOCK = threading.Lock()
+
+_T = TypeVar("_T")
+
+
+# Verified token payloads keyed by a prefix of a keyed digest of the token. Each entry
+# holds the full digest (confirmed with a constant-time comparison on lookup), the
+# payload and its own monotonic deadline: at most _TOKEN_CACHE_TTL_SECONDS away and
+# never past `exp`. The per-process digest key keeps cache keys unpredictable.
+_TOKEN_CACHE_TTL_SECONDS = 5.0
+_TOKEN_CACHE = TLRUCache(maxsize=10_000, ttu=lambda _key, entry, _now: entry[2])
+_TOKEN_DIGEST_KEY = os.urandom(32)
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+# Encoded once instead of on every sign/verify call.
+_JWT_KEY = settings.SECRET_KEY.encode("utf-8")
+
+
+def _prehash_password(password: str, salt: str) -> bytes:
+    """
+    Derive the bcrypt input for a password.
+
+    Args:
+        password: Raw password.
+        salt: 22-character bcrypt salt.
+
+    Returns:
+        bytes: Base64-encoded HMAC-SHA256 digest (44 bytes, no NUL bytes).
+    """
+    digest = hmac.new(salt.encode("ascii"), password.encode("utf-8"), hashlib.sha256).digest()
+    return base64.b64encode(digest)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a plaintext password against a bcrypt hash.
+    Verify a plaintext password against a bcrypt-sha256 hash.
 
     Args:
         plain_password: Raw password provided by the user.
-        hashed_password: Stored bcrypt hash.
+        hashed_password: Stored bcrypt-sha256 hash.
 
     Returns:
         bool: True if the password matches, False otherwise.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    match = _BCRYPT_SHA256_RE.match(hashed_password)
+    if match is None:
+        return False
+
+    ident, rounds, salt, checksum = match.groups()
+    config = f"${ident}${int(rounds):02d}${salt}".encode("ascii")
+    candidate = bcrypt.hashpw(_prehash_password(plain_password, salt), config)
+    return hmac.compare_digest(candidate[-31:], checksum.encode("ascii"))
 
 
 def get_password_hash(password: str) -> str:
     """
-    Hash a plaintext password using bcrypt.
+    Hash a plaintext password using bcrypt-sha256.
 
     Args:
         password: Raw password.
 
     Returns:
-        str: Bcrypt hash suitable for storage.
+        str: Bcrypt-sha256 hash suitable for storage.
+    """
+    config = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)  # b"$2b$<rounds>$<salt>"
+    salt = config[-22:].decode("ascii")
+    checksum = bcrypt.hashpw(_prehash_password(password, salt), config)[-31:].decode("ascii")
+    return f"$bcrypt-sha256$v=2,t=2b,r={settings.BCRYPT_ROUNDS}${salt}${checksum}"
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    """
+    Return the password hashing process pool, creating it on first use.
+
+    The pool size is capped by `PASSWORD_HASH_WORKERS`: `os.cpu_count()` reports
+    the host's cores inside containers, and every server worker has its own pool.
+
+    Returns:
+        ProcessPoolExecutor: Shared hashing pool.
+    """
+    global _HASH_POOL
+    with _HASH_POOL_LOCK:
+        if _HASH_POOL is None:
+            _HASH_POOL = ProcessPoolExecutor(
+                max_workers=max(1, min(os.cpu_count() or 1, settings.PASSWORD_HASH_WORKERS)),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _HASH_POOL
+
+
+def _discard_hash_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop a broken hashing pool so the next call creates a fresh one.
+
+    Args:
+        pool: The pool that raised `BrokenProcessPool`. Nothing happens if it has
+            already been replaced by a concurrent caller.
+    """
+    global _HASH_POOL
+    with _HASH_POOL_LOCK:
+        if _HASH_POOL is pool:
+            _HASH_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_hash_pool() -> None:
+    """
+    Shut down the password hashing process pool if it was started.
     """
-    # Safety net: if the runtime ever falls back to plain bcrypt (72-byte input limit),
-    # pre-hash long inputs to avoid 500 errors during registration/login.
-    if len(password.encode("utf-8")) > 72:
-        password = hashlib.sha256(password.encode("utf-8")).hexdigest()
-    return pwd_context.hash(password)
+    global _HASH_POOL
+    with _HASH_POOL_LOCK:
+        pool, _HASH_POOL = _HASH_POOL, None
+    if pool is not None:
+        pool.shutdown()
+
+
+async def _run_in_hash_pool(func: Callable[..., _T], *args: Any) -> _T:
+    """
+    Run a hashing function in the process pool, retrying once on a fresh pool if
+    the current one is broken.
+
+    Args:
+        func: Picklable module-level function to run.
+        *args: Arguments for `func`.
+
+    Returns:
+        The function's return value.
+
+    Raises:
+        BrokenProcessPool: If the freshly created pool breaks as well.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _get_hash_pool()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        _discard_hash_pool(pool)
+        return await loop.run_in_executor(_get_hash_pool(), func, *args)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in the hashing process pool without blocking the event loop.
+
+    Args:
+        plain_password: Raw password provided by the user.
+        hashed_password: Stored bcrypt-sha256 hash.
+
+    Returns:
+        bool: True if the password matches, False otherwise.
+    """
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def aget_password_hash(password: str) -> str:
+    """
+    Hash a password in the hashing process pool without blocking the event loop.
+
+    Args:
+        password: Raw password.
+
+    Returns:
+        str: Bcrypt-sha256 hash suitable for storage.
+    """
+    return await _run_in_hash_pool(get_password_hash, password)
 
 
 def create_access_token(data: Dict[str, Any], expires_minutes: Optional[int] = None) -> str:
@@ -58,9 +213,10 @@ def create_access_token(data: Dict[str, Any], expires_minutes: Optional[int] = N
     """
     to_encode = data.copy()
     expire_delta = expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES
-    expire = datetime.now(timezone.utc) + timedelta(minutes=expire_delta)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    issued_at = datetime.now(timezone.utc)
+    expire = issued_at + timedelta(minutes=expire_delta)
+    to_encode.update({"exp": expire, "iat": issued_at})
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
@@ -68,14 +224,34 @@ def decode_access_token(token: str) -> Dict[str, Any]:
     """
     Decode and validate a JWT access token.
 
+    Successfully verified payloads are cached briefly, so a client reusing its
+    token skips signature verification. Invalid tokens are never cached.
+
     Args:
         token: Encoded JWT token.
 
     Returns:
-        dict[str, Any]: Decoded payload.
+        dict[str, Any]: Decoded payload. Shared with the cache; do not mutate it.
 
     Raises:
-        JWTError: If the token is invalid or expired.
+        jwt.PyJWTError: If the token is invalid or expired.
     """
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    token_digest = hashlib.blake2b(token.encode("utf-8"), key=_TOKEN_DIGEST_KEY).digest()
+    cache_key = token_digest[:16]
+    with _TOKEN_CACHE_LOCK:
+        entry = _TOKEN_CACHE.get(cache_key)
+    if entry is not None and hmac.compare_digest(entry[0], token_digest):
+        return entry[1]
+
+    payload = jwt.decode(token, _JWT_KEY, algorithms=[settings.ALGORITHM])
+
+    # Never serve a cached payload past the token's own expiry.
+    ttl = _TOKEN_CACHE_TTL_SECONDS
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        ttl = min(ttl, expires_at - time.time())
+    if ttl > 0:
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[cache_key] = (token_digest, payload, time.monotonic() + ttl)
+    return payload
 
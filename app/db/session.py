@@ -1,55 +1,98 @@
-import time
-from contextlib import contextmanager
-from typing import Iterator
+import asyncio
+from typing import AsyncIterator
 
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 
 
-engine = create_engine(
+engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    # Reuse the most recently returned connection so surplus ones sit idle and expire.
+    pool_use_lifo=True,
 )
 
+# Attributes are not expired on commit: lazy refreshes cannot run implicitly under
+# asyncio, so objects must stay readable after `commit()`.
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-def create_db_and_tables() -> None:
+
+async def _wait_for_database() -> None:
+    """
+    Block until the database accepts connections.
+
+    MySQL containers may take a few seconds to become ready, so connecting is
+    retried with exponential backoff to avoid hard startup failures in Docker Compose.
+
+    Raises:
+        Exception: The last connection error if the database never became reachable.
+    """
+    attempts = 10
+    delay_seconds = 0.25
+    max_delay_seconds = 5.0
+    for attempt in range(attempts):
+        try:
+            async with engine.connect():
+                return
+        except Exception:  # pragma: no cover
+            if attempt == attempts - 1:
+                raise
+            await asyncio.sleep(delay_seconds)
+            delay_seconds = min(delay_seconds * 2, max_delay_seconds)
+
+
+async def create_db_and_tables() -> None:
     """
     Create database tables based on SQLModel metadata.
 
-    In production, prefer running migrations with Alembic instead of
-    relying on automatic table creation at startup.
+    Does nothing unless `AUTO_CREATE_TABLES` is enabled. In production, prefer
+    running migrations with Alembic instead of relying on automatic table
+    creation at startup.
     """
+    if not settings.AUTO_CREATE_TABLES:
+        return
+
     from app.models import models  # noqa: F401  # Ensure models are imported
 
-    # MySQL containers may take a few seconds to become ready.
-    # We retry to avoid hard startup failures in Docker Compose.
-    attempts = 20
-    delay_seconds = 1
-    last_error = None
-    for _ in range(attempts):
-        try:
-            SQLModel.metadata.create_all(engine)
-            return
-        except Exception as exc:  # pragma: no cover
-            last_error = exc
-            time.sleep(delay_seconds)
+    await _wait_for_database()
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
 
-    if last_error:
-        raise last_error
 
+async def warm_up_pool() -> None:
+    """
+    Open `DB_POOL_SIZE` connections up front so early requests skip connection setup.
 
-@contextmanager
-def get_session() -> Iterator[Session]:
+    The checkouts run concurrently, which makes the pool create distinct connections
+    rather than handing the same one back each time.
     """
-    Provide a SQLModel session for FastAPI dependencies.
+    await _wait_for_database()
+
+    async def _ping() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_ping() for _ in range(settings.DB_POOL_SIZE)))
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency that provides an async SQLModel session.
+
+    Handlers commit explicitly. The code after `yield` may run only after the
+    response has been sent, so committing there could acknowledge a write that
+    later fails. Closing the session rolls back any uncommitted work.
 
     Yields:
-        Session: Database session.
+        AsyncSession: Database session.
     """
-    session = Session(engine)
-    try:
+    async with SessionLocal() as session:
         yield session
-    finally:
-        session.close()
-
@@ -1,10 +1,37 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
 from app.core.config import settings
-from app.db.session import create_db_and_tables
+from app.core.security import shutdown_hash_pool
+from app.db.session import create_db_and_tables, engine, warm_up_pool
+from app.api import health
 from app.api.router import api_router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Application lifespan: startup work before `yield`, shutdown work after.
+
+    Startup creates missing tables (when enabled), fills the database
+    connection pool and generates the OpenAPI schema, so the first client to
+    request `/openapi.json` or `/docs` does not pay for building it.
+    Shutdown stops the password hashing worker processes and closes pooled
+    database connections.
+
+    Args:
+        app: Application being served.
+    """
+    await create_db_and_tables()
+    await warm_up_pool()
+    app.openapi()
+    yield
+    shutdown_hash_pool()
+    await engine.dispose()
+
+
 def create_app() -> FastAPI:
     """
     Create and configure the FastAPI application instance.
@@ -16,29 +43,13 @@ def create_app() -> FastAPI:
         title=settings.PROJECT_NAME,
         debug=settings.DEBUG,
         version="0.1.0",
+        lifespan=lifespan,
     )
 
     app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
-    @app.on_event("startup")
-    def on_startup() -> None:
-        """
-        FastAPI startup hook.
-
-        This ensures database tables are created before handling requests.
-        In production, prefer running migrations with Alembic instead.
-        """
-        create_db_and_tables()
-
-    @app.get("/health", tags=["health"])
-    def health_check() -> dict:
-        """
-        Simple health check endpoint.
-
-        Returns:
-            dict: Health status payload.
-        """
-        return {"status": "healthy"}
+    # Also serve the health check at the root path, outside the API prefix.
+    app.include_router(health.router, tags=["health"])
 
     return app
 
@@ -1,8 +1,8 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
 
-from sqlmodel import Column, Field, SQLModel
+from sqlmodel import Column, Field, SQLModel, UniqueConstraint
 from sqlmodel.sql.sqltypes import AutoString
 
 
@@ -41,7 +41,7 @@ class Classroom(ClassroomBase, table=True):
     """Classroom table model."""
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    teacher_id: int = Field(foreign_key="user.id")
+    teacher_id: int = Field(foreign_key="user.id", index=True)
 
 
 class ClassroomEnrollment(SQLModel, table=True):
@@ -63,7 +63,7 @@ class Lesson(LessonBase, table=True):
     """Lesson table model."""
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    classroom_id: int = Field(foreign_key="classroom.id")
+    classroom_id: int = Field(foreign_key="classroom.id", index=True)
 
 
 class AssignmentBase(SQLModel):
@@ -80,7 +80,7 @@ class Assignment(AssignmentBase, table=True):
     """Assignment table model."""
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    lesson_id: int = Field(foreign_key="lesson.id")
+    lesson_id: int = Field(foreign_key="lesson.id", index=True)
 
 
 class SubmissionBase(SQLModel):
@@ -93,14 +93,21 @@ class SubmissionBase(SQLModel):
 class Submission(SubmissionBase, table=True):
     """Submission table model."""
 
+    # One submission per student and assignment. The unique index also serves
+    # "submissions for an assignment", so a single-column index on assignment_id
+    # would be redundant.
+    __table_args__ = (
+        UniqueConstraint("assignment_id", "student_id", name="uq_submission_assignment_student"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     assignment_id: int = Field(foreign_key="assignment.id")
-    student_id: int = Field(foreign_key="user.id")
-    submitted_at: datetime = Field(default_factory=datetime.utcnow)
+    student_id: int = Field(foreign_key="user.id", index=True)
+    submitted_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     # Grading fields
     score: Optional[float] = None
     feedback: Optional[str] = None
     graded_at: Optional[datetime] = None
-    graded_by: Optional[int] = Field(default=None, foreign_key="user.id")
+    graded_by: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
 
@@ -23,9 +23,14 @@ class TokenData(BaseModel):
 
 
 class LoginRequest(SQLModel):
-    """Schema for JSON-based login."""
+    """
+    Schema for JSON-based login.
 
-    email: EmailStr
+    The email is only used as a lookup key, so it is not run through the email
+    validator; like the form-based login, an unknown address simply fails to match.
+    """
+
+    email: str = Field(max_length=255)
     password: str = Field(min_length=8, max_length=128)
 
 
@@ -56,10 +61,15 @@ class UserRegister(SQLModel):
 
 
 class UserRead(SQLModel):
-    """Schema for returning user data."""
+    """
+    Schema for returning user data.
+
+    Stored emails were validated at registration (and are unique via the index on
+    `User.email`), so responses do not validate them again.
+    """
 
     id: int
-    email: EmailStr
+    email: str
     full_name: str
     role: UserRole
 
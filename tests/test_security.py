@@ -0,0 +1,86 @@
+import asyncio
+import os
+import signal
+
+import pytest
+
+from app.core import security
+from app.core.security import (
+    _prehash_password,
+    averify_password,
+    get_password_hash,
+    shutdown_hash_pool,
+    verify_password,
+)
+
+
+# Generated with passlib 1.7.4: bcrypt_sha256.using(rounds=4).hash(...)
+PASSLIB_PASSWORD = "correct horse battery staple"
+PASSLIB_HASH = "$bcrypt-sha256$v=2,t=2b,r=4$68twP4RwHq3I5U8iJjFkP.$UtEssNwhYlknAfJ8NFJH0nOqIMtqSNW"
+PASSLIB_LONG_PASSWORD = "é" * 80  # 160 UTF-8 bytes
+PASSLIB_LONG_HASH = (
+    "$bcrypt-sha256$v=2,t=2b,r=4$L9Dld/v2iasTmPX6vxYDwu$PWwnyVpIuUWXBStb2H2geszbYfSz0OW"
+)
+
+
+def test_verifies_passlib_hash() -> None:
+    """Test that a passlib-generated hash verifies and rejects a wrong password."""
+    assert verify_password(PASSLIB_PASSWORD, PASSLIB_HASH)
+    assert not verify_password(PASSLIB_PASSWORD + "!", PASSLIB_HASH)
+
+
+def test_verifies_passlib_hash_of_long_password() -> None:
+    """Test that a passlib hash of a password over 72 bytes verifies."""
+    assert verify_password(PASSLIB_LONG_PASSWORD, PASSLIB_LONG_HASH)
+    assert not verify_password(PASSLIB_LONG_PASSWORD[:36], PASSLIB_LONG_HASH)
+
+
+def test_long_password_round_trip() -> None:
+    """Test hashing and verifying a password longer than bcrypt's 72-byte limit."""
+    password = "a" * 72 + "tail"
+    hashed = get_password_hash(password)
+
+    assert hashed.startswith("$bcrypt-sha256$v=2,t=2b,")
+    assert verify_password(password, hashed)
+    # Bytes past bcrypt's 72-byte limit must still count.
+    assert not verify_password("a" * 72, hashed)
+
+
+@pytest.mark.parametrize("password", ["", "short", "a" * 72, "é" * 200])
+def test_prehash_is_44_bytes_without_nul(password: str) -> None:
+    """Test that the bcrypt input is always 44 base64 bytes, whatever the password length."""
+    prehashed = _prehash_password(password, "68twP4RwHq3I5U8iJjFkP.")
+
+    assert len(prehashed) == 44
+    assert b"\0" not in prehashed
+
+
+@pytest.mark.parametrize(
+    "hashed_password",
+    [
+        "",
+        "not-a-hash",
+        "$2b$04$68twP4RwHq3I5U8iJjFkP.UtEssNwhYlknAfJ8NFJH0nOqIMtqSNW",
+        "$bcrypt-sha256$v=1,2b,4$68twP4RwHq3I5U8iJjFkP.$UtEssNwhYlknAfJ8NFJH0nOqIMtqSNW",
+        PASSLIB_HASH[:-1],
+    ],
+)
+def test_malformed_hash_is_rejected(hashed_password: str) -> None:
+    """Test that malformed or foreign hash formats fail verification instead of raising."""
+    assert not verify_password(PASSLIB_PASSWORD, hashed_password)
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="requires SIGKILL")
+def test_hash_pool_recovers_after_worker_dies() -> None:
+    """Test that killing a hashing worker does not break later verifications."""
+
+    async def verify_after_worker_killed() -> None:
+        assert await averify_password(PASSLIB_PASSWORD, PASSLIB_HASH)
+        worker_pid = next(iter(security._HASH_POOL._processes))
+        os.kill(worker_pid, signal.SIGKILL)
+        assert await averify_password(PASSLIB_PASSWORD, PASSLIB_HASH)
+
+    try:
+        asyncio.run(verify_after_worker_killed())
+    finally:
+        shutdown_hash_pool()